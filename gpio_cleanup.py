@@ -3,6 +3,10 @@
 🔧 GPIO Cleanup Tool für Raspberry Pi 5
 Speziell um "GPIO busy" Probleme zu lösen
 
+sensor_reader.py gibt GPIO 18 bei "GPIO busy" selbst frei und belegt ihn
+neu (ohne Service-Neustart). Dieses Tool ist nur noch der letzte Ausweg,
+wenn ein fremder Prozess die Leitung dauerhaft hält.
+
 Aufruf:
 python3 gpio_cleanup.py
 """
@@ -38,9 +38,23 @@ def check_ds18b20_hardware():
         except:
             print(f"   ⚠️ {module} Status unbekannt")
     
-    # 2. w1 Devices
-    print("\n🌡️ DS18B20 Sensoren erkannt:")
+    # 2. 1-Wire Busse (ein w1_bus_master pro w1-gpio Overlay)
     w1_path = "/sys/bus/w1/devices/"
+    print("\n🔌 1-Wire Busse:")
+    try:
+        masters = sorted(d for d in os.listdir(w1_path) if d.startswith('w1_bus_master'))
+        for master in masters:
+            with open(f"{w1_path}{master}/w1_master_slaves", 'r') as f:
+                slaves = [s for s in f.read().split() if s.startswith('28-')]
+            bulk = os.path.exists(f"{w1_path}{master}/therm_bulk_read")
+            print(f"   ✅ {master}: {len(slaves)} DS18B20{' (Bulk-Read)' if bulk else ''}")
+        if not masters:
+            print("   ❌ Kein w1_bus_master gefunden")
+    except Exception as e:
+        print(f"   ⚠️ Busse nicht lesbar: {e}")
+
+    # 3. w1 Devices
+    print("\n🌡️ DS18B20 Sensoren erkannt:")
     try:
         if os.path.exists(w1_path):
             devices = [d for d in os.listdir(w1_path) if d.startswith('28-')]
@@ -153,7 +167,7 @@ def check_config():
         print(f"❌ config.ini nicht gefunden: {config_file}")
         return None
     try:
-        config = configparser.ConfigParser()
+        config = configparser.ConfigParser(interpolation=None)
         config.read(config_file)
         print("📋 Konfigurierte Sensoren:")
         # Database Config
@@ -185,7 +199,7 @@ def check_influxdb_connection():
         from influxdb_client import InfluxDBClient
         
         # Config laden
-        config = configparser.ConfigParser()
+        config = configparser.ConfigParser(interpolation=None)
         config.read("/home/pi/pi5-sensors/config.ini")
         
         if 'database' not in config:
@@ -299,6 +313,11 @@ def check_service_status():
     except Exception as e:
         print(f"❌ Log Fehler: {e}")
 
+    # Ring-Puffer mit allen Details (inkl. DEBUG) anfordern
+    print("\n📝 Detail-Log (Ring-Puffer):")
+    print("   sudo systemctl kill -s USR1 pi5-sensors")
+    print("   cat /tmp/pi5-sensors-log.txt")
+
 def main():
     """Hauptfunktion"""
     print("🔍 SENSOR DEBUG TOOL für Pi5")
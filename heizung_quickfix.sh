@@ -29,9 +29,9 @@ After=docker.service network.target
 Type=simple
 User=pi
 WorkingDirectory=/home/pi/pi5-sensors
-ExecStartPre=/bin/sleep 20
 ExecStartPre=/usr/bin/sudo /usr/bin/docker compose up -d
 ExecStart=/home/pi/pi5-sensors/venv/bin/python sensor_reader.py
+ExecReload=/bin/kill -HUP $MAINPID
 Restart=always
 RestartSec=30
 
@@ -52,7 +52,7 @@ sudo docker compose up -d
 echo ""
 echo "🎉 Quick Fix abgeschlossen!"
 echo ""
-echo "🔧 Bei 'GPIO busy' Fehler:"
+echo "🔧 Bei dauerhaftem 'GPIO busy' Fehler (Recovery im Service greift nicht):"
 echo "   sudo systemctl stop pi5-sensors"
 echo "   curl -sSL https://raw.githubusercontent.com/OliverRebock/Heizung_small/main/gpio_cleanup.py | python3"
 echo ""
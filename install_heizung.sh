@@ -11,6 +11,9 @@
 
 set -e  # Beende bei Fehlern
 
+# Verzeichnis dieses Skripts (enthält sensor_reader.py)
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 echo "🚀 ULTRA-MINIMAL Pi5 Sensor Installation"
 echo "========================================"
 echo "📦 9 Sensoren + InfluxDB + Grafana (ohne Login)"
@@ -65,212 +68,10 @@ cd "$PROJECT_DIR"
 # =============================================================================
 # 4. PYTHON SENSOR SCRIPT
 # =============================================================================
-echo "🐍 Erstelle Sensor Script..."
-
-cat > sensor_reader.py << 'EOF'
-#!/usr/bin/env python3
-"""Ultra-minimal 9-Sensor Reader für Pi5"""
-
-import os
-import sys
-import time
-import glob
-import configparser
-from datetime import datetime
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
-
-class Pi5SensorReader:
-    def __init__(self):
-        self.config = configparser.ConfigParser()
-        self.config.read('config.ini')
-        self.setup_influxdb()
-        
-    def setup_influxdb(self):
-        """InfluxDB Verbindung"""
-        self.client = InfluxDBClient(
-            url="http://localhost:8086",
-            token="pi5-token-2024",
-            org="pi5org"
-        )
-        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
-        
-    def read_ds18b20_sensors(self):
-        """Lese alle DS18B20 Sensoren"""
-        sensors = []
-        devices = glob.glob('/sys/bus/w1/devices/28-*')
-        
-        for i, device in enumerate(devices[:8], 1):
-            try:
-                with open(f"{device}/w1_slave", 'r') as f:
-                    data = f.read()
-                if 'YES' in data:
-                    temp_pos = data.find('t=') + 2
-                    temp = float(data[temp_pos:]) / 1000.0
-                    
-                    name = self.config.get('labels', f'ds18b20_{i}', fallback=f'Sensor {i}')
-                    sensors.append({
-                        'name': name,
-                        'temperature': temp,
-                        'sensor_id': f'ds18b20_{i}'
-                    })
-                    print(f"   DS18B20 {i}: {temp:.1f}°C ({name})")
-            except Exception as e:
-                print(f"   ❌ DS18B20 {i}: {e}")
-                
-        return sensors
-        
-    def read_dht22(self):
-        """Lese DHT22 Sensor - Pi 5 optimiert mit GPIO cleanup"""
-        dht = None
-        try:
-            import adafruit_dht
-            import board
-            
-            # Pi 5 spezifische Initialisierung 
-            dht = adafruit_dht.DHT22(board.D18, use_pulseio=False)
-            
-            # 5 Versuche mit längeren Pausen für Pi 5
-            for attempt in range(5):
-                try:
-                    # Pi 5 braucht mehr Zeit zwischen Lesungen
-                    if attempt > 0:
-                        time.sleep(3)
-                    
-                    temp = dht.temperature
-                    humidity = dht.humidity
-                    
-                    # Validierung der Werte
-                    if (temp is not None and humidity is not None and 
-                        -40 <= temp <= 80 and 0 <= humidity <= 100):
-                        name = self.config.get('labels', 'dht22', fallback='Raumklima')
-                        print(f"   DHT22: {temp:.1f}°C, {humidity:.1f}% ({name})")
-                        return {
-                            'name': name,
-                            'temperature': temp,
-                            'humidity': humidity,
-                            'sensor_id': 'dht22'
-                        }
-                    else:
-                        print(f"   ⚠️  DHT22: Ungültige Werte (T:{temp}, H:{humidity})")
-                        
-                except RuntimeError as e:
-                    # Pi 5 RuntimeError behandeln
-                    if "Checksum did not validate" in str(e):
-                        print(f"   ⚠️  DHT22: Prüfsummen-Fehler (Versuch {attempt+1}/5)")
-                    elif "timed out" in str(e):
-                        print(f"   ⚠️  DHT22: Timeout (Versuch {attempt+1}/5)")
-                    else:
-                        print(f"   ⚠️  DHT22: {e} (Versuch {attempt+1}/5)")
-                except Exception as e:
-                    if "GPIO busy" in str(e):
-                        print(f"   ⚠️  DHT22: GPIO 18 belegt (Versuch {attempt+1}/5)")
-                        # GPIO cleanup versuchen
-                        if dht:
-                            try:
-                                dht.exit()
-                            except:
-                                pass
-                        time.sleep(5)  # Längere Pause bei GPIO busy
-                    else:
-                        print(f"   ⚠️  DHT22: Unerwarteter Fehler: {e}")
-                        
-            print("   ❌ DHT22: Keine gültigen Daten nach 5 Versuchen")
-            
-        except ImportError:
-            print("   ❌ DHT22: adafruit-circuitpython-dht nicht installiert")
-        except Exception as e:
-            print(f"   ❌ DHT22: Initialisierung fehlgeschlagen: {e}")
-        finally:
-            # GPIO cleanup
-            if dht:
-                try:
-                    dht.exit()
-                except:
-                    pass
-        except Exception as e:
-            print(f"   ❌ DHT22: {e}")
-            
-        return None
-        
-    def write_to_influxdb(self, sensors, dht22_data):
-        """Schreibe Daten zu InfluxDB"""
-        try:
-            points = []
-            
-            # DS18B20 Sensoren
-            for sensor in sensors:
-                point = Point("temperature") \
-                    .tag("sensor_type", "ds18b20") \
-                    .tag("sensor_id", sensor['sensor_id']) \
-                    .tag("name", sensor['name']) \
-                    .field("value", sensor['temperature'])
-                points.append(point)
-                
-            # DHT22 Sensor
-            if dht22_data:
-                # Temperatur
-                point = Point("temperature") \
-                    .tag("sensor_type", "dht22") \
-                    .tag("sensor_id", "dht22") \
-                    .tag("name", dht22_data['name']) \
-                    .field("value", dht22_data['temperature'])
-                points.append(point)
-                
-                # Luftfeuchtigkeit
-                point = Point("humidity") \
-                    .tag("sensor_type", "dht22") \
-                    .tag("sensor_id", "dht22") \
-                    .tag("name", dht22_data['name']) \
-                    .field("value", dht22_data['humidity'])
-                points.append(point)
-                
-            # Schreibe alle Punkte
-            if points:
-                self.write_api.write(bucket="sensors", record=points)
-                print(f"   ✅ {len(points)} Datenpunkte geschrieben")
-                
-        except Exception as e:
-            print(f"   ❌ InfluxDB Fehler: {e}")
-            
-    def run_once(self):
-        """Ein Durchlauf"""
-        print(f"🌡️  Lese Sensoren... {datetime.now().strftime('%H:%M:%S')}")
-        
-        # Lese alle Sensoren
-        ds18b20_sensors = self.read_ds18b20_sensors()
-        dht22_data = self.read_dht22()
-        
-        # Schreibe zu InfluxDB
-        self.write_to_influxdb(ds18b20_sensors, dht22_data)
-        
-        total_sensors = len(ds18b20_sensors) + (1 if dht22_data else 0)
-        print(f"   📊 {total_sensors}/9 Sensoren erfolgreich gelesen")
-        
-    def run_continuous(self):
-        """Kontinuierlich laufen"""
-        print("🔄 Starte kontinuierliche Überwachung (30s Intervall)")
-        while True:
-            try:
-                self.run_once()
-                time.sleep(30)
-            except KeyboardInterrupt:
-                print("\n👋 Beendet durch Benutzer")
-                break
-            except Exception as e:
-                print(f"❌ Fehler: {e}")
-                time.sleep(30)
-
-if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "test":
-        # Test-Modus
-        reader = Pi5SensorReader()
-        reader.run_once()
-    else:
-        # Kontinuierlicher Modus
-        reader = Pi5SensorReader()
-        reader.run_continuous()
-EOF
+echo "🐍 Kopiere Sensor Script..."
+
+cp "$SCRIPT_DIR/sensor_reader.py" sensor_reader.py
+cp "$SCRIPT_DIR/sensor_soak.py" sensor_soak.py
 
 # =============================================================================
 # 5. KONFIGURATION
@@ -286,16 +87,57 @@ org = pi5org
 bucket = sensors
 
 [labels]
-# 🏷️ Passe die Sensornamen hier an
-ds18b20_1 = Vorlauf Heizkreis
-ds18b20_2 = Rücklauf Heizkreis  
-ds18b20_3 = Warmwasser Speicher
-ds18b20_4 = Außentemperatur
-ds18b20_5 = Heizraum
-ds18b20_6 = Pufferspeicher Oben
-ds18b20_7 = Pufferspeicher Mitte
-ds18b20_8 = Pufferspeicher Unten
+# 🏷️ Passe die Sensornamen hier an (Zuordnung über die ROM-ID, unabhängig vom Bus)
+EOF
+
+# Labels per ROM-ID: eine Nummerierung ds18b20_N verschiebt sich, sobald ein
+# Sensor wegen Verkabelungsproblemen aus w1_master_slaves verschwindet
+SENSOR_NAMES=("Vorlauf Heizkreis" "Rücklauf Heizkreis" "Warmwasser Speicher"
+              "Außentemperatur" "Heizraum" "Pufferspeicher Oben"
+              "Pufferspeicher Mitte" "Pufferspeicher Unten")
+ROM_IDS=$(cat /sys/bus/w1/devices/w1_bus_master*/w1_master_slaves 2>/dev/null | grep '^28-' | sort -u || true)
+if [ -n "$ROM_IDS" ]; then
+    i=0
+    for rom_id in $ROM_IDS; do
+        echo "$rom_id = ${SENSOR_NAMES[$i]:-Sensor $((i + 1))}" >> config.ini
+        i=$((i + 1))
+    done
+    echo "   ✅ $i DS18B20 in config.ini eingetragen - Namen bitte prüfen"
+else
+    # 1-Wire ist erst nach dem Neustart aktiv
+    cat >> config.ini << 'EOF'
+# Noch keine DS18B20 gefunden (1-Wire erst nach Neustart aktiv).
+# ROM-IDs anzeigen: ls /sys/bus/w1/devices/ - dann z.B.:
+# 28-0000003701e8 = Vorlauf Heizkreis
+EOF
+    echo "   ⚠️ Keine DS18B20 gefunden - Labels nach dem Neustart in config.ini eintragen"
+fi
+
+cat >> config.ini << 'EOF'
 dht22 = Raumklima Heizraum
+
+[ds18b20]
+# 🎚️ Auflösung (9-12 bit), Intervall (s, 0 = jeder Zyklus), Grenzwerte
+resolution = 12
+interval = 0
+min = -55
+max = 125
+
+[health]
+# 🩺 Retry, Backoff und Quarantäne für defekte DS18B20
+retries = 1
+backoff_max_cycles = 8
+quarantine_ratio = 0.8
+window = 20
+probe_interval = 60
+
+[logging]
+# 📝 INFO = eine Zeile pro Zyklus, DEBUG = jeder Sensor
+level = INFO
+dedup_window = 600
+summary_every = 1
+ring_buffer = 2000
+ring_buffer_file = /tmp/pi5-sensors-log.txt
 EOF
 
 # =============================================================================
@@ -402,9 +244,9 @@ After=docker.service network.target
 Type=simple
 User=pi
 WorkingDirectory=$PROJECT_DIR
-ExecStartPre=/bin/sleep 20
 ExecStartPre=/usr/bin/sudo /usr/bin/docker compose up -d
 ExecStart=$PROJECT_DIR/venv/bin/python sensor_reader.py
+ExecReload=/bin/kill -HUP \$MAINPID
 Restart=always
 RestartSec=30
 
@@ -465,6 +307,8 @@ echo ""
 echo "🔧 Befehle:"
 echo "   Service start: sudo systemctl start pi5-sensors"
 echo "   Service logs:  sudo journalctl -u pi5-sensors -f"
+echo "   Config laden:  sudo systemctl reload pi5-sensors"
+echo "   Log Details:   sudo systemctl kill -s USR1 pi5-sensors && cat /tmp/pi5-sensors-log.txt"
 echo "   Sensor test:   cd $PROJECT_DIR && source venv/bin/activate && python sensor_reader.py test"
 echo ""
 echo "⚠️  NEUSTART ERFORDERLICH für GPIO!"
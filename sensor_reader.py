@@ -0,0 +1,1199 @@
+#!/usr/bin/env python3
+"""Ultra-minimal 9-Sensor Reader für Pi5
+
+Schwere Module (influxdb_client, adafruit_dht, board) werden erst bei
+Bedarf importiert, damit der erste Messwert direkt nach dem Start vorliegt.
+"""
+
+import time
+
+# Startzeitpunkt für Time-to-first-sample / Time-to-first-write
+PROCESS_START = time.monotonic()
+
+import gc
+import os
+import sys
+import json
+import glob
+import signal
+import logging
+import threading
+import configparser
+import urllib.request
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import MappingProxyType
+
+# Konfigurationsdatei im Arbeitsverzeichnis des Dienstes
+CONFIG_FILE = 'config.ini'
+
+# sysfs Pfad des 1-Wire Subsystems (w1-gpio Overlay, ein Bus pro GPIO Pin)
+W1_DEVICES = '/sys/bus/w1/devices'
+
+# Maximale Wartezeit für eine Bulk-Konvertierung (12 bit = 750 ms)
+BULK_TIMEOUT = 1.5
+
+# DHT22 Datenleitung und Backoff für die GPIO-busy Recovery (Sekunden)
+DHT22_PIN = 18
+DHT22_RECOVERY_BACKOFF = 1.0
+DHT22_RECOVERY_BACKOFF_MAX = 60.0
+
+# Lokaler Puffer (Datenpunkte), solange InfluxDB nicht erreichbar ist
+BUFFER_MAX_POINTS = 50000
+
+# Backoff für InfluxDB /health Abfragen und fehlgeschlagene Writes (Sekunden)
+INFLUX_HEALTH_BACKOFF = 0.5
+INFLUX_HEALTH_BACKOFF_MAX = 30.0
+
+# HTTP Status, mit dem InfluxDB einzelne ungültige Datenpunkte ablehnt
+INFLUX_REJECTED_STATUS = (400, 413, 422)
+
+
+def escape_tag(value):
+    """Tag-Schlüssel/-Wert für das InfluxDB Line Protocol escapen"""
+    return str(value).replace('\\', '\\\\').replace(',', '\\,') \
+        .replace('=', '\\=').replace(' ', '\\ ')
+
+
+def format_field(value):
+    """Feldwert im Line Protocol (bool, int, float, string)"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, float):
+        return repr(value)
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def format_tags(tags):
+    """Tags als fertiger Line Protocol Teil (',k=v,...') zum Vorberechnen"""
+    return ''.join(f',{escape_tag(k)}={escape_tag(v)}' for k, v in tags.items())
+
+
+def line_protocol(measurement, tags, fields, timestamp_ns):
+    """Datenpunkt als Line Protocol - kein influxdb_client zum Puffern nötig
+
+    tags: dict oder bereits mit format_tags() vorberechneter String
+    """
+    tag_str = tags if isinstance(tags, str) else format_tags(tags)
+    field_str = ','.join(f'{escape_tag(k)}={format_field(v)}' for k, v in fields.items())
+    return f'{escape_tag(measurement)}{tag_str} {field_str} {timestamp_ns}'
+
+
+# =============================================================================
+# LOGGING
+# =============================================================================
+
+log = logging.getLogger('pi5-sensors')
+
+# journald Prioritäten (sd-daemon Präfix), damit "journalctl -p warning" filtert
+JOURNAL_PRIORITY = {
+    logging.DEBUG: 7,
+    logging.INFO: 6,
+    logging.WARNING: 4,
+    logging.ERROR: 3,
+    logging.CRITICAL: 2,
+}
+
+
+class JournalFormatter(logging.Formatter):
+    """Unter systemd mit <Priorität> Präfix, sonst mit Level-Namen"""
+
+    def __init__(self):
+        super().__init__('%(levelname)-7s %(message)s')
+        self.journal = 'INVOCATION_ID' in os.environ
+
+    def format(self, record):
+        if self.journal:
+            priority = JOURNAL_PRIORITY.get(record.levelno, 6)
+            return f"<{priority}>{record.getMessage()}"
+        return super().format(record)
+
+
+class DedupFilter(logging.Filter):
+    """Wiederholte Fehler zusammenfassen ("CRC Fehler ×37 in 10 min")
+
+    Nur Records mit extra={'key': ...} werden dedupliziert: die erste Meldung
+    pro Schlüssel geht durch, weitere werden im Zeitfenster nur gezählt.
+    """
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'key', None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is None or now - entry['since'] >= self.window:
+                suppressed = entry['count'] if entry else 0
+                self.seen[key] = {'since': now, 'count': 0, 'message': record.getMessage(),
+                                  'level': record.levelno}
+                if suppressed:
+                    minutes = (now - entry['since']) / 60
+                    record.msg = f"{record.getMessage()} (×{suppressed + 1} in {minutes:.0f} min)"
+                    record.args = None
+                return True
+            entry['count'] += 1
+            entry['message'] = record.getMessage()
+            return False
+
+    def flush(self):
+        """Zähler abgelaufener Fenster melden (Fehler, die inzwischen aufgehört haben)"""
+        now = time.monotonic()
+        with self.lock:
+            expired = [(key, entry) for key, entry in self.seen.items()
+                       if now - entry['since'] >= self.window]
+            for key, _ in expired:
+                del self.seen[key]
+        for key, entry in expired:
+            if entry['count']:
+                minutes = (now - entry['since']) / 60
+                log.log(entry['level'], f"{entry['message']} "
+                        f"(×{entry['count']} weitere in {minutes:.0f} min)")
+
+
+class RingBufferHandler(logging.Handler):
+    """Hält die letzten Log-Records (inkl. DEBUG) im Speicher, Dump auf Anfrage"""
+
+    def __init__(self, capacity, path):
+        super().__init__(logging.DEBUG)
+        self.records = deque(maxlen=capacity)
+        self.path = path
+        self.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(message)s'))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self):
+        """Ring-Puffer in Datei schreiben (z.B. per SIGUSR1)"""
+        with self.lock:
+            records = list(self.records)
+        with open(self.path, 'w') as f:
+            for record in records:
+                f.write(self.format(record) + '\n')
+        log.info(f"📝 {len(records)} Log-Einträge nach {self.path} geschrieben")
+
+
+def setup_logging(config, level=None):
+    """Log-Level, Deduplizierung und Ring-Puffer aus Sektion [logging]"""
+    level = level or config.get('logging', 'level', fallback='INFO').upper()
+    window = config.getfloat('logging', 'dedup_window', fallback=600)
+    capacity = config.getint('logging', 'ring_buffer', fallback=2000)
+    path = config.get('logging', 'ring_buffer_file', fallback='/tmp/pi5-sensors-log.txt')
+
+    log.handlers.clear()
+    log.propagate = False
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(level)
+    console.setFormatter(JournalFormatter())
+    dedup = DedupFilter(window)
+    console.addFilter(dedup)
+    log.addHandler(console)
+
+    ring = None
+    if capacity > 0:
+        ring = RingBufferHandler(capacity, path)
+        log.addHandler(ring)
+        log.setLevel(logging.DEBUG)
+    else:
+        log.setLevel(level)
+    return dedup, ring
+
+
+def update_logging(config, dedup, ring, level=None):
+    """Level, Dedup-Fenster und Ring-Puffer nach einem Neuladen übernehmen"""
+    level = level or config.get('logging', 'level', fallback='INFO').upper()
+    dedup.window = config.getfloat('logging', 'dedup_window', fallback=600)
+    capacity = config.getint('logging', 'ring_buffer', fallback=2000)
+    path = config.get('logging', 'ring_buffer_file', fallback='/tmp/pi5-sensors-log.txt')
+
+    if capacity <= 0 and ring:
+        log.removeHandler(ring)
+        ring = None
+    elif capacity > 0 and ring is None:
+        ring = RingBufferHandler(capacity, path)
+        log.addHandler(ring)
+    elif ring:
+        with ring.lock:
+            # Vorhandene Einträge behalten, nur die Größe ändern
+            if ring.records.maxlen != capacity:
+                ring.records = deque(ring.records, maxlen=capacity)
+            ring.path = path
+
+    for handler in log.handlers:
+        if not isinstance(handler, RingBufferHandler):
+            handler.setLevel(level)
+    log.setLevel(logging.DEBUG if ring else level)
+    return ring
+
+
+class W1ReadError(Exception):
+    """Fehler beim Lesen eines DS18B20 (CRC, I/O, ungültige Daten)"""
+
+
+class W1Bus:
+    """Ein 1-Wire Bus-Master (w1_bus_masterN) mit seinen DS18B20 Sensoren"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.sensors = []
+        self.supports_bulk = os.path.exists(os.path.join(path, 'therm_bulk_read'))
+
+        # Statistik für Fehlerrate und Timing pro Bus
+        self.cycles = 0
+        self.reads = 0
+        self.errors = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.last_errors = 0
+        self.retries = 0
+
+    def set_resolution(self, rom_id, bits):
+        """Auflösung eines DS18B20 setzen (9-12 bit), nur wenn sie abweicht"""
+        path = os.path.join(self.path, rom_id, 'resolution')
+        with open(path, 'r') as f:
+            if int(f.read().strip()) == bits:
+                return False
+        with open(path, 'w') as f:
+            f.write(f'{bits}\n')
+        return True
+
+    def discover(self):
+        """Lese die DS18B20 Slaves dieses Busses"""
+        try:
+            with open(os.path.join(self.path, 'w1_master_slaves'), 'r') as f:
+                slaves = f.read().split()
+        except OSError:
+            slaves = []
+        self.sensors = sorted(s for s in slaves if s.startswith('28-'))
+        return self.sensors
+
+    def trigger_bulk_conversion(self):
+        """Starte die Temperaturmessung auf allen Sensoren des Busses gleichzeitig
+
+        Liefert False, wenn die Konvertierung nicht innerhalb BULK_TIMEOUT fertig war.
+        """
+        bulk_file = os.path.join(self.path, 'therm_bulk_read')
+        with open(bulk_file, 'w') as f:
+            f.write('trigger\n')
+
+        # -1 = Konvertierung läuft noch, 1 = fertig (noch nicht gelesen)
+        deadline = time.monotonic() + BULK_TIMEOUT
+        while time.monotonic() < deadline:
+            with open(bulk_file, 'r') as f:
+                if f.read().strip() != '-1':
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def read_sensor(self, rom_id):
+        """Lese einen DS18B20 (nach Bulk-Konvertierung ohne neue Messung)"""
+        try:
+            with open(os.path.join(self.path, rom_id, 'w1_slave'), 'r') as f:
+                data = f.read()
+        except OSError as e:
+            raise W1ReadError(f"I/O Fehler: {e}")
+        if 'YES' not in data:
+            raise W1ReadError("CRC Fehler")
+        temp_pos = data.find('t=')
+        if temp_pos < 0:
+            raise W1ReadError("Keine Temperatur in w1_slave")
+        try:
+            return float(data[temp_pos + 2:]) / 1000.0
+        except ValueError:
+            raise W1ReadError("Ungültige Daten")
+
+    def read_all(self, rom_ids=None, retries=0):
+        """Lese die Sensoren dieses Busses, liefert (Werte, Fehler)
+
+        rom_ids: nur diese Sensoren lesen (None = alle)
+        retries: sofortige Wiederholungen pro Sensor bei CRC/I/O Fehler
+        """
+        start = time.monotonic()
+        rom_ids = self.sensors if rom_ids is None else rom_ids
+        results = {}
+        errors = {}
+
+        converted = True
+        if self.supports_bulk and rom_ids:
+            try:
+                converted = self.trigger_bulk_conversion()
+            except OSError:
+                # Ohne Bulk-Read misst jeder Sensor beim Lesen einzeln
+                self.supports_bulk = False
+
+        for rom_id in rom_ids:
+            if not converted:
+                # Scratchpad enthält noch alte Werte - nicht als Messung ausgeben
+                errors[rom_id] = "Bulk-Konvertierung Timeout"
+                continue
+            for attempt in range(retries + 1):
+                try:
+                    # Eine Wiederholung startet eine neue Einzelmessung
+                    results[rom_id] = self.read_sensor(rom_id)
+                    errors.pop(rom_id, None)
+                    break
+                except W1ReadError as e:
+                    errors[rom_id] = str(e)
+                    if attempt < retries:
+                        self.retries += 1
+
+        self.last_duration = time.monotonic() - start
+        self.total_duration += self.last_duration
+        self.cycles += 1
+        self.reads += len(rom_ids)
+        self.errors += len(errors)
+        self.last_errors = len(errors)
+        return results, errors
+
+    @property
+    def error_rate(self):
+        return self.errors / self.reads if self.reads else 0.0
+
+
+def discover_w1_buses(w1_path=W1_DEVICES):
+    """Finde alle 1-Wire Bus-Master (einer pro w1-gpio Overlay)"""
+    buses = []
+    for path in sorted(glob.glob(os.path.join(w1_path, 'w1_bus_master*'))):
+        bus = W1Bus(path)
+        bus.discover()
+        buses.append(bus)
+    return buses
+
+
+def is_gpio_busy(error):
+    """Erkennt 'GPIO busy' von lgpio/libgpiod/Blinka"""
+    message = str(error).lower()
+    return 'gpio busy' in message or 'resource busy' in message or 'errno 16' in message
+
+
+def gpio_holders():
+    """PIDs anderer Prozesse, die einen gpiochip geöffnet haben"""
+    holders = []
+    for fd_dir in glob.glob('/proc/[0-9]*/fd'):
+        pid = int(fd_dir.split('/')[2])
+        if pid == os.getpid():
+            continue
+        try:
+            for fd in os.listdir(fd_dir):
+                if os.readlink(os.path.join(fd_dir, fd)).startswith('/dev/gpiochip'):
+                    holders.append(pid)
+                    break
+        except OSError:
+            continue
+    return holders
+
+
+class DHT22Sensor:
+    """DHT22 mit dauerhaft geöffneter Leitung und GPIO-busy Recovery im Prozess
+
+    Statt den Service zu stoppen (gpio_cleanup.py) wird die eigene Leitung
+    freigegeben und nach einem Backoff neu belegt. read() blockiert während
+    der Recovery nicht - die übrigen Sensoren laufen weiter.
+    """
+
+    def __init__(self, pin=DHT22_PIN):
+        self.pin = pin
+        self.device = None
+        self.available = True
+
+        # Recovery Zustand und Statistik
+        self.busy_since = None
+        self.next_attempt = 0.0
+        self.backoff = DHT22_RECOVERY_BACKOFF
+        self.recoveries = 0
+        self.recovery_downtime = 0.0
+        self.last_recovery = None
+
+    def open(self):
+        """Leitung belegen (adafruit_dht/board erst hier importieren)"""
+        import adafruit_dht
+        import board
+
+        # Pi 5 spezifische Initialisierung
+        self.device = adafruit_dht.DHT22(getattr(board, f'D{self.pin}'), use_pulseio=False)
+
+    def release(self):
+        """Eigene Belegung der Leitung freigeben"""
+        if self.device:
+            try:
+                self.device.exit()
+            except Exception:
+                pass
+        self.device = None
+        # Verwaiste Pin-Objekte (ohne exit()) geben die Leitung erst im Finalizer frei
+        gc.collect()
+
+    def start_recovery(self, error):
+        """Leitung freigeben und Neubelegung mit Backoff planen"""
+        now = time.monotonic()
+        if self.busy_since is None:
+            self.busy_since = now
+            self.backoff = DHT22_RECOVERY_BACKOFF
+            holders = gpio_holders()
+            log.warning(f"⚠️  DHT22: GPIO {self.pin} belegt ({error}) - Recovery gestartet"
+                        f"{f', gpiochip offen in PID {holders}' if holders else ''}",
+                        extra={'key': 'dht22:busy'})
+        else:
+            self.backoff = min(self.backoff * 2, DHT22_RECOVERY_BACKOFF_MAX)
+        self.release()
+        self.next_attempt = now + self.backoff
+
+    def finish_recovery(self):
+        """Leitung wieder belegt - Ausfallzeit verbuchen"""
+        downtime = time.monotonic() - self.busy_since
+        self.recoveries += 1
+        self.recovery_downtime += downtime
+        self.last_recovery = downtime
+        self.busy_since = None
+        log.info(f"♻️  DHT22: GPIO {self.pin} zurückgewonnen nach {downtime:.1f}s "
+                 f"(Recovery #{self.recoveries}, gesamt {self.recovery_downtime:.0f}s)",
+                 extra={'key': 'dht22:recovered'})
+
+    def read(self, attempts=5):
+        """Lese Temperatur und Luftfeuchtigkeit, None bei Fehler oder Recovery"""
+        if not self.available or time.monotonic() < self.next_attempt:
+            return None
+
+        if self.device is None:
+            try:
+                self.open()
+            except ImportError:
+                log.error("❌ DHT22: adafruit-circuitpython-dht nicht installiert")
+                self.available = False
+                return None
+            except Exception as e:
+                if is_gpio_busy(e):
+                    self.start_recovery(e)
+                else:
+                    log.error(f"❌ DHT22: Initialisierung fehlgeschlagen: {e}",
+                              extra={'key': 'dht22:init'})
+                return None
+
+        # 5 Versuche mit längeren Pausen für Pi 5
+        failures = {}
+        for attempt in range(attempts):
+            # Pi 5 braucht mehr Zeit zwischen Lesungen
+            if attempt > 0:
+                time.sleep(3)
+
+            try:
+                temp = self.device.temperature
+                humidity = self.device.humidity
+                error = None
+            except Exception as e:
+                # Ohne pulseio belegt adafruit_dht die Leitung bei jeder Lesung,
+                # "GPIO busy" kommt also hier und nicht schon in open()
+                if is_gpio_busy(e):
+                    self.start_recovery(e)
+                    return None
+                temp = humidity = None
+                error = e
+
+            # Leitung ohne "GPIO busy" belegt - erst jetzt ist die Recovery fertig
+            if self.busy_since is not None:
+                self.finish_recovery()
+
+            if isinstance(error, RuntimeError):
+                # Pi 5 RuntimeError behandeln
+                if "Checksum did not validate" in str(error):
+                    kind = 'Prüfsumme'
+                elif "timed out" in str(error):
+                    kind = 'Timeout'
+                else:
+                    kind = str(error)
+                failures[kind] = failures.get(kind, 0) + 1
+                log.debug(f"DHT22: {error} (Versuch {attempt+1}/{attempts})")
+                continue
+            if error is not None:
+                failures[str(error)] = failures.get(str(error), 0) + 1
+                log.debug(f"DHT22: Unerwarteter Fehler: {error}")
+                continue
+
+            # Validierung der Werte
+            if (temp is not None and humidity is not None and
+                -40 <= temp <= 80 and 0 <= humidity <= 100):
+                return temp, humidity
+            log.debug(f"DHT22: Ungültige Werte (T:{temp}, H:{humidity})")
+            failures['Ungültig'] = failures.get('Ungültig', 0) + 1
+
+        details = ', '.join(f"{kind} ×{count}" for kind, count in failures.items())
+        log.warning(f"❌ DHT22: Keine gültigen Daten nach {attempts} Versuchen ({details})",
+                    extra={'key': 'dht22:nodata'})
+        return None
+
+    @property
+    def recovering(self):
+        return self.busy_since is not None
+
+
+class HealthPolicy:
+    """Grenzwerte für Retry, Backoff und Quarantäne (Sektion [health])"""
+
+    def __init__(self, config):
+        # Sofortige Wiederholungen bei CRC Fehler im selben Zyklus
+        self.retries = config.getint('health', 'retries', fallback=1)
+        # Backoff: nach n Fehlzyklen in Folge 2^(n-1) Zyklen aussetzen (max.)
+        self.backoff_max_cycles = config.getint('health', 'backoff_max_cycles', fallback=8)
+        # Quarantäne ab dieser Fehlerquote im Fenster der letzten Zyklen
+        self.quarantine_ratio = config.getfloat('health', 'quarantine_ratio', fallback=0.8)
+        self.window = config.getint('health', 'window', fallback=20)
+        # Im Quarantäne-Zustand nur jeden n-ten Zyklus prüfen (deutlich > Backoff)
+        self.probe_interval = config.getint('health', 'probe_interval', fallback=60)
+
+
+class SensorHealth:
+    """Zustandsautomat eines Sensors: ok -> backoff -> quarantine -> ok"""
+
+    OK = 'ok'
+    BACKOFF = 'backoff'
+    QUARANTINE = 'quarantine'
+
+    def __init__(self, sensor_id, policy):
+        self.sensor_id = sensor_id
+        self.policy = policy
+        self.state = self.OK
+        self.consecutive_failures = 0
+        self.history = deque(maxlen=policy.window)
+        self.next_cycle = 0
+
+    @property
+    def failure_ratio(self):
+        if not self.history:
+            return 0.0
+        return self.history.count(False) / len(self.history)
+
+    def set_policy(self, policy):
+        """Neue Grenzwerte nach einem Neuladen, Verlauf auf neues window kürzen"""
+        self.policy = policy
+        if self.history.maxlen != policy.window:
+            self.history = deque(self.history, maxlen=policy.window)
+
+    def should_read(self, cycle):
+        """Soll der Sensor in diesem Zyklus gelesen werden?"""
+        return cycle >= self.next_cycle
+
+    def record(self, cycle, ok):
+        """Ergebnis eines Zyklus verbuchen, liefert ein Event bei Zustandswechsel"""
+        old_state = self.state
+        self.history.append(ok)
+
+        if ok:
+            self.consecutive_failures = 0
+            self.next_cycle = cycle + 1
+            if self.state == self.QUARANTINE:
+                # Neu anfangen, sonst greift die alte Fehlerquote sofort wieder
+                self.history.clear()
+            self.state = self.OK
+        else:
+            self.consecutive_failures += 1
+            enough_history = len(self.history) >= self.policy.window // 2
+            # Auch nach dem längsten Aussetzen noch defekt -> Quarantäne
+            last_skip = 2 ** (self.consecutive_failures - 2) if self.consecutive_failures >= 2 else 0
+            backoff_exhausted = last_skip >= self.policy.backoff_max_cycles
+            if self.state == self.QUARANTINE or backoff_exhausted or (
+                    enough_history and self.failure_ratio >= self.policy.quarantine_ratio):
+                self.state = self.QUARANTINE
+                self.next_cycle = cycle + self.policy.probe_interval
+            elif self.consecutive_failures >= 2:
+                self.state = self.BACKOFF
+                skip = min(2 ** (self.consecutive_failures - 1),
+                           self.policy.backoff_max_cycles)
+                self.next_cycle = cycle + skip
+            else:
+                self.next_cycle = cycle + 1
+
+        if self.state != old_state:
+            return {
+                'time': datetime.now(),
+                'sensor_id': self.sensor_id,
+                'from': old_state,
+                'to': self.state,
+                'failures': self.consecutive_failures,
+                'failure_ratio': self.failure_ratio,
+            }
+        return None
+
+
+class ConfigError(ValueError):
+    """Ungültige config.ini - die bisherige Konfiguration bleibt aktiv"""
+
+
+# Vorgaben für DS18B20 (Sektion [ds18b20], pro Sensor eine Sektion [28-...])
+DS18B20_DEFAULTS = {'resolution': 12, 'interval': 0.0, 'min': -55.0, 'max': 125.0}
+
+SensorSettings = namedtuple('SensorSettings',
+                            'label resolution interval min max tags')
+
+
+def parse_sensor_settings(config, section, base):
+    """Auflösung, Intervall und Grenzwerte einer Sektion, Rest aus base"""
+    try:
+        settings = {
+            'resolution': config.getint(section, 'resolution', fallback=base['resolution']),
+            'interval': config.getfloat(section, 'interval', fallback=base['interval']),
+            'min': config.getfloat(section, 'min', fallback=base['min']),
+            'max': config.getfloat(section, 'max', fallback=base['max']),
+        }
+    except ValueError as e:
+        raise ConfigError(f"[{section}]: {e}")
+    if settings['resolution'] not in (9, 10, 11, 12):
+        raise ConfigError(f"[{section}] resolution muss 9-12 sein")
+    if settings['interval'] < 0:
+        raise ConfigError(f"[{section}] interval darf nicht negativ sein")
+    if settings['min'] >= settings['max']:
+        raise ConfigError(f"[{section}] min muss kleiner als max sein")
+    return settings
+
+
+class SensorTable:
+    """Unveränderliche Sensor-Tabelle aus der config.ini
+
+    Wird einmal pro (Neu-)Laden gebaut und als Ganzes ausgetauscht. Labels,
+    Grenzwerte und InfluxDB Tags werden nicht mehr pro Zyklus nachgeschlagen.
+    """
+
+    def __init__(self, config):
+        labels = dict(config['labels']) if config.has_section('labels') else {}
+        self.defaults = parse_sensor_settings(config, 'ds18b20', DS18B20_DEFAULTS)
+
+        # Einträge per ROM-ID (Sektion [28-...] oder Label) oder altem ds18b20_N Label
+        keys = {key for key in labels if key != 'dht22'}
+        keys |= {section for section in config.sections() if section.startswith('28-')}
+        entries = {}
+        for key in keys:
+            settings = (parse_sensor_settings(config, key, self.defaults)
+                        if config.has_section(key) else self.defaults)
+            entries[key] = (labels.get(key), settings)
+        self.entries = MappingProxyType(entries)
+
+        label = labels.get('dht22', 'Raumklima')
+        self.dht22 = SensorSettings(label, None, 0.0, -40.0, 80.0, format_tags({
+            'sensor_type': 'dht22', 'sensor_id': 'dht22', 'name': label}))
+        self.resolved = {}
+
+    def ds18b20(self, rom_id, sensor_id, index, bus):
+        """Einstellungen eines DS18B20 inkl. fertiger Tags (einmal berechnet)"""
+        key = (rom_id, sensor_id, bus)
+        settings = self.resolved.get(key)
+        if settings is None:
+            label, values = self.entries.get(rom_id, (None, self.defaults))
+            if label is None:
+                label = self.entries.get(sensor_id, (None,))[0] or f'Sensor {index}'
+            tags = format_tags({'sensor_type': 'ds18b20', 'sensor_id': sensor_id,
+                                'name': label, 'rom_id': rom_id, 'bus': bus})
+            settings = SensorSettings(label, values['resolution'], values['interval'],
+                                      values['min'], values['max'], tags)
+            self.resolved[key] = settings
+        return settings
+
+    def __len__(self):
+        return len(self.entries) + 1
+
+
+def load_config(path=CONFIG_FILE):
+    """config.ini einlesen und prüfen, liefert (config, Tabelle, HealthPolicy)"""
+    # Ohne Interpolation, damit z.B. "Feuchte %" als Label erlaubt ist
+    config = configparser.ConfigParser(interpolation=None)
+    try:
+        # read() überspringt fehlende/unlesbare Dateien stillschweigend
+        if not config.read(path, encoding='utf-8'):
+            raise ConfigError(f"{path} nicht gefunden oder nicht lesbar")
+        table = SensorTable(config)
+    except UnicodeDecodeError as e:
+        raise ConfigError(f"{path} ist nicht UTF-8 kodiert ({e.reason} an Position {e.start})")
+    except (configparser.Error, OSError) as e:
+        raise ConfigError(str(e).splitlines()[0])
+
+    try:
+        policy = HealthPolicy(config)
+        summary_every = config.getint('logging', 'summary_every', fallback=1)
+        dedup_window = config.getfloat('logging', 'dedup_window', fallback=600)
+        config.getint('logging', 'ring_buffer', fallback=2000)
+    except ValueError as e:
+        raise ConfigError(str(e))
+    if policy.retries < 0:
+        raise ConfigError("[health] retries darf nicht negativ sein")
+    if policy.window < 1 or policy.backoff_max_cycles < 1:
+        raise ConfigError("[health] window und backoff_max_cycles müssen >= 1 sein")
+    if policy.probe_interval < policy.backoff_max_cycles:
+        raise ConfigError("[health] probe_interval muss >= backoff_max_cycles sein")
+    if not 0 < policy.quarantine_ratio <= 1:
+        raise ConfigError("[health] quarantine_ratio muss zwischen 0 und 1 liegen")
+    if summary_every < 1:
+        raise ConfigError("[logging] summary_every muss >= 1 sein")
+    if dedup_window < 0:
+        raise ConfigError("[logging] dedup_window darf nicht negativ sein")
+    level = config.get('logging', 'level', fallback='INFO').upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ConfigError(f"[logging] unbekanntes level: {level}")
+    return config, table, policy
+
+
+class Pi5SensorReader:
+    def __init__(self, log_level=None):
+        self.config, self.table, self.health_policy = load_config()
+        self.config_mtime = self.config_file_mtime()
+        self.reload_requested = False
+        self.wake = threading.Event()
+        self.log_level = log_level
+        self.dedup, self.ring_buffer = setup_logging(self.config, log_level)
+        self.summary_every = self.config.getint('logging', 'summary_every', fallback=1)
+        self.last_read = {}
+        self.resolution = {}
+        self.buses = {}
+        self.executor = None
+        self.executor_workers = 0
+        self.cycle = 0
+        self.health = {}
+        self.health_events = []
+        self.dht22 = DHT22Sensor()
+        self.dht22_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dht22')
+
+        # InfluxDB erst verbinden, wenn /health "pass" meldet
+        self.client = None
+        self.write_api = None
+        self.buffer = deque(maxlen=BUFFER_MAX_POINTS)
+        self.next_health_check = 0.0
+        self.health_backoff = INFLUX_HEALTH_BACKOFF
+        self.first_sample = None
+        self.first_write = None
+        self.startup_reported = False
+
+    def config_file_mtime(self):
+        try:
+            return os.stat(CONFIG_FILE).st_mtime
+        except OSError:
+            return None
+
+    def request_reload(self, signum=None, frame=None):
+        """SIGHUP: config.ini sofort neu laden (Wartezeit bis zum Zyklus unterbrechen)"""
+        self.reload_requested = True
+        # Event nicht im Signal-Handler setzen - der Handler könnte den Lock halten
+        threading.Thread(target=self.wake.set, daemon=True).start()
+
+    def maybe_reload(self):
+        """config.ini bei SIGHUP oder Dateiänderung neu laden und atomar tauschen"""
+        mtime = self.config_file_mtime()
+        if not self.reload_requested and mtime == self.config_mtime:
+            return False
+        if mtime is not None and time.time() - mtime < 1.0:
+            # Datei wird evtl. gerade geschrieben - im nächsten Zyklus laden
+            return False
+        self.reload_requested = False
+
+        try:
+            config, table, policy = load_config()
+        except ConfigError as e:
+            # Abgelehnte Datei nicht bei jedem Zyklus erneut melden
+            self.config_mtime = mtime
+            log.error(f"❌ config.ini ungültig, alte Konfiguration bleibt aktiv: {e}")
+            return False
+
+        self.config_mtime = mtime
+
+        self.config, self.table, self.health_policy = config, table, policy
+        for health in self.health.values():
+            health.set_policy(policy)
+        self.summary_every = config.getint('logging', 'summary_every', fallback=1)
+        self.ring_buffer = update_logging(config, self.dedup, self.ring_buffer,
+                                          self.log_level)
+        log.info(f"🔄 config.ini neu geladen ({len(table)} Sensor-Einträge)")
+        return True
+
+    def apply_resolution(self, bus, rom_id, bits):
+        """Auflösung aus der Sensor-Tabelle auf den DS18B20 übertragen
+
+        Das sysfs Attribut resolution ist nur für root schreibbar (siehe README).
+        Schlägt das Schreiben fehl, wird es im nächsten Zyklus erneut versucht.
+        """
+        try:
+            changed = bus.set_resolution(rom_id, bits)
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️  {rom_id}: Auflösung {bits} bit nicht gesetzt: {e}",
+                        extra={'key': f"resolution:{rom_id}"})
+            return
+        self.resolution[rom_id] = bits
+        if changed:
+            log.info(f"🎚️  {rom_id}: Auflösung {bits} bit")
+
+    @property
+    def influx_url(self):
+        host = self.config.get('database', 'host', fallback='localhost')
+        port = self.config.get('database', 'port', fallback='8086')
+        return f"http://{host}:{port}"
+
+    def influxdb_ready(self):
+        """InfluxDB /health prüfen (mit Backoff, ohne influxdb_client)"""
+        now = time.monotonic()
+        if now < self.next_health_check:
+            return False
+        if self.write_api is not None:
+            # Verbindung bleibt nach Schreibfehlern bestehen, nur der Backoff greift
+            return True
+        try:
+            with urllib.request.urlopen(f"{self.influx_url}/health", timeout=2) as response:
+                status = json.load(response).get('status')
+        except Exception:
+            status = None
+        if status != 'pass':
+            self.next_health_check = now + self.health_backoff
+            self.health_backoff = min(self.health_backoff * 2, INFLUX_HEALTH_BACKOFF_MAX)
+            return False
+        self.health_backoff = INFLUX_HEALTH_BACKOFF
+        self.setup_influxdb()
+        return True
+
+    def setup_influxdb(self):
+        """InfluxDB Verbindung"""
+        from influxdb_client import InfluxDBClient
+        from influxdb_client.client.write_api import SYNCHRONOUS
+
+        if self.client is not None:
+            self.client.close()
+        self.client = InfluxDBClient(
+            url=self.influx_url,
+            token=self.config.get('database', 'token', fallback='pi5-token-2024'),
+            org=self.config.get('database', 'org', fallback='pi5org')
+        )
+        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+        log.info(f"🗄️  InfluxDB bereit ({time.monotonic() - PROCESS_START:.1f}s nach Start)")
+
+    def refresh_buses(self):
+        """Bus-Master und Sensor-Zuordnung aktualisieren (Hotplug, neue GPIO Pins)"""
+        for bus in discover_w1_buses():
+            known = self.buses.get(bus.name)
+            if known:
+                known.discover()
+            else:
+                self.buses[bus.name] = bus
+                log.info(f"🔌 {bus.name}: {len(bus.sensors)} Sensoren"
+                         f"{' (Bulk-Read)' if bus.supports_bulk else ''}")
+
+        # Ein Thread pro Bus - die Busse arbeiten elektrisch unabhängig
+        workers = max(1, len(self.buses))
+        if workers != self.executor_workers:
+            if self.executor:
+                self.executor.shutdown(wait=True)
+            self.executor = ThreadPoolExecutor(max_workers=workers,
+                                               thread_name_prefix='w1')
+            self.executor_workers = workers
+
+    def read_ds18b20_sensors(self):
+        """Lese alle DS18B20 Sensoren (alle Busse parallel)"""
+        self.refresh_buses()
+        buses = [bus for bus in self.buses.values() if bus.sensors]
+
+        # Stabile Nummerierung über alle Busse hinweg (sortiert nach ROM-ID)
+        table = self.table
+        bus_of = {rom_id: bus.name for bus in buses for rom_id in bus.sensors}
+        settings = {rom_id: table.ds18b20(rom_id, f'ds18b20_{i}', i, bus_of[rom_id])
+                    for i, rom_id in enumerate(sorted(bus_of), 1)}
+
+        # Sensoren im Backoff, in Quarantäne oder vor ihrem Intervall überspringen
+        now = time.monotonic()
+        due = {}
+        for bus in buses:
+            for rom_id in bus.sensors:
+                if rom_id not in self.health:
+                    self.health[rom_id] = SensorHealth(rom_id, self.health_policy)
+                if self.resolution.get(rom_id) != settings[rom_id].resolution:
+                    self.apply_resolution(bus, rom_id, settings[rom_id].resolution)
+            due[bus.name] = [r for r in bus.sensors
+                             if self.health[r].should_read(self.cycle)
+                             and now - self.last_read.get(r, -1e9) >= settings[r].interval]
+
+        def read_bus(bus):
+            return bus.read_all(due[bus.name], retries=self.health_policy.retries)
+
+        values = {}
+        failures = {}
+        for results, errors in self.executor.map(read_bus, buses):
+            values.update(results)
+            failures.update(errors)
+
+        # Werte außerhalb der Grenzwerte min/max zählen als Fehler
+        out_of_range = set()
+        for rom_id, temp in list(values.items()):
+            if not settings[rom_id].min <= temp <= settings[rom_id].max:
+                failures[rom_id] = f"Wert außerhalb Grenzwerte ({temp:.1f}°C)"
+                out_of_range.add(rom_id)
+                del values[rom_id]
+
+        for bus in buses:
+            for rom_id in due[bus.name]:
+                self.last_read[rom_id] = now
+                event = self.health[rom_id].record(self.cycle, rom_id not in failures)
+                if event:
+                    self.health_events.append(event)
+                    log.log(logging.INFO if event['to'] == SensorHealth.OK else logging.WARNING,
+                            f"🩺 {rom_id}: {event['from']} → {event['to']} "
+                            f"({event['failures']} Fehler in Folge, "
+                            f"Fehlerquote {event['failure_ratio'] * 100:.0f}%)")
+
+        sensors = []
+        for i, rom_id in enumerate(sorted(bus_of), 1):
+            sensor_id = f'ds18b20_{i}'
+            if rom_id not in values and rom_id not in failures:
+                health = self.health[rom_id]
+                log.debug(f"⏸️  DS18B20 {i}: {health.state}, nächster Versuch in "
+                          f"{max(health.next_cycle - self.cycle, 0)} Zyklen ({rom_id})")
+                continue
+            if rom_id in failures:
+                # Messwert nicht in den Schlüssel, sonst greift die Deduplizierung nicht
+                kind = 'range' if rom_id in out_of_range else failures[rom_id]
+                log.warning(f"❌ DS18B20 {i}: {failures[rom_id]} ({rom_id}, {bus_of[rom_id]})",
+                            extra={'key': f"w1:{rom_id}:{kind}"})
+                continue
+            temp = values[rom_id]
+            name = settings[rom_id].label
+            sensors.append({
+                'name': name,
+                'temperature': temp,
+                'sensor_id': sensor_id,
+                'rom_id': rom_id,
+                'bus': bus_of[rom_id],
+                'tags': settings[rom_id].tags
+            })
+            log.debug(f"DS18B20 {i}: {temp:.1f}°C ({name})")
+
+        for bus in buses:
+            log.debug(f"🔌 {bus.name}: {len(bus.sensors)} Sensoren, "
+                      f"{bus.last_duration * 1000:.0f} ms, "
+                      f"Fehlerrate {bus.error_rate * 100:.1f}%")
+
+        return sensors
+
+    def read_dht22(self):
+        """Lese DHT22 Sensor - Pi 5 optimiert, GPIO Recovery im Prozess"""
+        values = self.dht22.read()
+        if values is None:
+            return None
+        temp, humidity = values
+        settings = self.table.dht22
+        log.debug(f"DHT22: {temp:.1f}°C, {humidity:.1f}% ({settings.label})")
+        return {
+            'name': settings.label,
+            'temperature': temp,
+            'humidity': humidity,
+            'sensor_id': 'dht22',
+            'tags': settings.tags
+        }
+
+    def buffer_points(self, sensors, dht22_data):
+        """Messwerte als Line Protocol in den lokalen Puffer legen"""
+        now_ns = time.time_ns()
+        points = []
+
+        # DS18B20 Sensoren
+        for sensor in sensors:
+            points.append(line_protocol("temperature", sensor['tags'],
+                                        {"value": sensor['temperature']}, now_ns))
+
+        # 1-Wire Bus Statistik (Fehlerrate und Dauer pro Bus)
+        for bus in self.buses.values():
+            if not bus.sensors:
+                continue
+            points.append(line_protocol("w1_bus", {"bus": bus.name}, {
+                "sensors": len(bus.sensors),
+                "duration_ms": bus.last_duration * 1000,
+                "errors": bus.last_errors,
+                "error_rate": bus.error_rate,
+            }, now_ns))
+
+        # Zustandswechsel der Sensoren (ok/backoff/quarantine)
+        for event in self.health_events:
+            points.append(line_protocol("sensor_health", {
+                "rom_id": event['sensor_id'],
+                "state": event['to'],
+            }, {
+                "previous": event['from'],
+                "failures": event['failures'],
+                "failure_ratio": event['failure_ratio'],
+            }, int(event['time'].timestamp() * 1e9)))
+        self.health_events = []
+
+        # DHT22 GPIO Recovery (Anzahl und Ausfallzeit)
+        points.append(line_protocol("dht22_recovery", {"sensor_id": "dht22"}, {
+            "recoveries": self.dht22.recoveries,
+            "downtime_s": self.dht22.recovery_downtime,
+            "recovering": self.dht22.recovering,
+        }, now_ns))
+
+        # DHT22 Sensor
+        if dht22_data:
+            tags = dht22_data['tags']
+            # Temperatur
+            points.append(line_protocol("temperature", tags,
+                                        {"value": dht22_data['temperature']}, now_ns))
+            # Luftfeuchtigkeit
+            points.append(line_protocol("humidity", tags,
+                                        {"value": dht22_data['humidity']}, now_ns))
+
+        # Startzeiten einmalig mitschreiben
+        if self.first_write is not None and self.first_sample is not None \
+                and not self.startup_reported:
+            points.append(line_protocol("startup", {}, {
+                "time_to_first_sample_s": self.first_sample,
+                "time_to_first_write_s": self.first_write,
+            }, now_ns))
+            self.startup_reported = True
+
+        self.buffer.extend(points)
+
+    def write_to_influxdb(self):
+        """Schreibe den lokalen Puffer zu InfluxDB, liefert die Anzahl Punkte"""
+        if not self.buffer:
+            return 0
+        if not self.influxdb_ready():
+            log.debug(f"⏳ InfluxDB nicht bereit - {len(self.buffer)} Datenpunkte gepuffert")
+            return 0
+
+        try:
+            bucket = self.config.get('database', 'bucket', fallback='sensors')
+            written = self.write_points(bucket, list(self.buffer))
+        except Exception as e:
+            log.error(f"❌ InfluxDB Fehler: {e}", extra={'key': 'influx:write'})
+            # Client behalten, erst nach Backoff erneut schreiben (z.B. 401, 5xx)
+            self.next_health_check = time.monotonic() + self.health_backoff
+            self.health_backoff = min(self.health_backoff * 2, INFLUX_HEALTH_BACKOFF_MAX)
+            return 0
+
+        self.health_backoff = INFLUX_HEALTH_BACKOFF
+        log.debug(f"✅ {written} Datenpunkte geschrieben")
+        if self.first_write is None and written:
+            self.first_write = time.monotonic() - PROCESS_START
+            log.info(f"⏱️  Erster Schreibvorgang nach {self.first_write:.1f}s")
+        return written
+
+    def write_points(self, bucket, points):
+        """Punkte schreiben und aus dem Puffer entfernen, liefert die Anzahl
+
+        Lehnt InfluxDB den Batch wegen ungültiger Daten ab, wird er halbiert,
+        bis der fehlerhafte Punkt isoliert ist. Dieser wird verworfen, damit er
+        nicht alle folgenden Schreibvorgänge blockiert.
+        """
+        try:
+            self.write_api.write(bucket=bucket, record=points)
+        except Exception as e:
+            if getattr(e, 'status', None) not in INFLUX_REJECTED_STATUS:
+                raise
+            if len(points) == 1:
+                self.buffer.popleft()
+                log.warning(f"⚠️  Datenpunkt von InfluxDB abgelehnt ({e.status}), verworfen: "
+                            f"{points[0]}", extra={'key': 'influx:rejected'})
+                return 0
+            half = len(points) // 2
+            return (self.write_points(bucket, points[:half]) +
+                    self.write_points(bucket, points[half:]))
+
+        for _ in points:
+            self.buffer.popleft()
+        return len(points)
+
+    def run_once(self):
+        """Ein Durchlauf"""
+        self.maybe_reload()
+        log.debug(f"🌡️  Lese Sensoren... {datetime.now().strftime('%H:%M:%S')}")
+
+        # Lese alle Sensoren (DHT22 parallel, eine Recovery bremst die DS18B20 nicht)
+        dht22_future = self.dht22_executor.submit(self.read_dht22)
+        ds18b20_sensors = self.read_ds18b20_sensors()
+        dht22_data = dht22_future.result()
+
+        if self.first_sample is None and (ds18b20_sensors or dht22_data):
+            self.first_sample = time.monotonic() - PROCESS_START
+            log.info(f"⏱️  Erster Messwert nach {self.first_sample:.1f}s")
+
+        # Puffern und zu InfluxDB schreiben (sobald erreichbar)
+        self.buffer_points(ds18b20_sensors, dht22_data)
+        written = self.write_to_influxdb()
+
+        self.log_summary(ds18b20_sensors, dht22_data, written)
+        self.dedup.flush()
+        self.cycle += 1
+
+    def log_summary(self, ds18b20_sensors, dht22_data, written):
+        """Ein kompakter Log-Eintrag pro Zyklus statt einer Zeile pro Sensor"""
+        expected = sum(len(bus.sensors) for bus in self.buses.values()) + 1
+        total_sensors = len(ds18b20_sensors) + (1 if dht22_data else 0)
+        parts = [f"📊 {total_sensors}/{expected} Sensoren"]
+        for bus in self.buses.values():
+            if bus.sensors:
+                parts.append(f"{bus.name} {bus.last_duration * 1000:.0f}ms "
+                             f"{bus.error_rate * 100:.1f}%")
+        if dht22_data:
+            parts.append(f"DHT22 {dht22_data['temperature']:.1f}°C "
+                         f"{dht22_data['humidity']:.0f}%")
+        if written:
+            parts.append(f"{written} Punkte geschrieben")
+        if self.buffer:
+            parts.append(f"{len(self.buffer)} gepuffert")
+
+        level = logging.INFO if self.cycle % self.summary_every == 0 else logging.DEBUG
+        log.log(level, ' | '.join(parts))
+
+    def wait_for_next_cycle(self, seconds):
+        """Bis zum nächsten Zyklus warten, gepufferte Daten dabei nachschreiben"""
+        deadline = time.monotonic() + seconds
+        while True:
+            if self.wake.is_set():
+                # SIGHUP: nicht bis zum nächsten Zyklus mit dem Neuladen warten
+                self.wake.clear()
+                self.maybe_reload()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.buffer:
+                # Nicht 30s warten, bis InfluxDB nach dem Boot bereit ist
+                timeout = max(0.0, min(remaining, self.next_health_check - time.monotonic()))
+                if self.wake.wait(timeout):
+                    continue
+                if time.monotonic() < deadline and self.influxdb_ready():
+                    self.write_to_influxdb()
+            else:
+                self.wake.wait(remaining)
+
+    def dump_log(self, signum=None, frame=None):
+        """Ring-Puffer auf Anfrage schreiben (systemctl kill -s USR1 pi5-sensors)"""
+        if self.ring_buffer:
+            # Nicht im Signal-Handler schreiben - der Handler könnte den Lock halten
+            threading.Thread(target=self.ring_buffer.dump, daemon=True).start()
+
+    def run_continuous(self):
+        """Kontinuierlich laufen"""
+        signal.signal(signal.SIGUSR1, self.dump_log)
+        signal.signal(signal.SIGHUP, self.request_reload)
+        log.info("🔄 Starte kontinuierliche Überwachung (30s Intervall)")
+        while True:
+            try:
+                self.run_once()
+                self.wait_for_next_cycle(30)
+            except KeyboardInterrupt:
+                log.info("👋 Beendet durch Benutzer")
+                self.dht22.release()
+                break
+            except Exception as e:
+                log.error(f"❌ Fehler: {e}", extra={'key': f"cycle:{type(e).__name__}"})
+                time.sleep(30)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        # Test-Modus (alle Details ausgeben)
+        reader = Pi5SensorReader(log_level='DEBUG')
+        reader.run_once()
+        reader.dht22.release()
+    else:
+        # Kontinuierlicher Modus
+        reader = Pi5SensorReader()
+        reader.run_continuous()
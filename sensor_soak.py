@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+🧪 Soak Test für alle Sensoren - Langzeitmessung über Stunden
+Misst pro Sensor Latenzverteilung (p50/p90/p99), CRC-/Prüfsummen-/Timeout-
+Fehler und Wertestabilität mit konstantem Speicherbedarf und schreibt am
+Ende einen JSON- und CSV-Bericht. Damit lassen sich Verkabelung und
+Erfassungsmodi (Bulk-Read vs. Einzelmessung) quantitativ vergleichen.
+
+Aufruf:
+python3 sensor_soak.py --hours 4 --interval 5
+python3 sensor_soak.py --hours 0.1 --interval 1 --simulate
+"""
+
+import os
+import sys
+import csv
+import json
+import math
+import time
+import random
+import argparse
+import configparser
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sensor_reader import (W1Bus, W1ReadError, DHT22Sensor, discover_w1_buses,
+                           is_gpio_busy)
+
+
+class LatencySketch:
+    """Streaming-Histogramm mit logarithmischen Buckets (±5% Genauigkeit)
+
+    Speicher bleibt konstant, egal wie viele Messungen hinzukommen.
+    """
+
+    GROWTH = 1.1
+    MIN_MS = 0.01
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value_ms):
+        index = int(math.log(max(value_ms, self.MIN_MS) / self.MIN_MS, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def percentile(self, p):
+        """Wert des p-Perzentils (Bucket-Mitte), None ohne Daten"""
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low = self.MIN_MS * self.GROWTH ** index
+                value = low * (1 + self.GROWTH) / 2
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class ValueStats:
+    """Mittelwert/Streuung (Welford), Min/Max und größter Sprung"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.last = None
+        self.max_step = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self.last is not None:
+            self.max_step = max(self.max_step, abs(value - self.last))
+        self.last = value
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 3) if self.count else None,
+            'stddev': round(self.stddev, 3),
+            'min': self.min,
+            'max': self.max,
+            'max_step': round(self.max_step, 3),
+        }
+
+
+class SensorSoakStats:
+    """Alle Kennzahlen eines Sensors während des Soak Tests"""
+
+    ERROR_KINDS = ('crc', 'checksum', 'timeout', 'io', 'invalid', 'gpio_busy', 'other')
+
+    def __init__(self, sensor_id, name, sensor_type, bus=None):
+        self.sensor_id = sensor_id
+        self.name = name
+        self.sensor_type = sensor_type
+        self.bus = bus
+        self.attempts = 0
+        self.ok = 0
+        self.errors = dict.fromkeys(self.ERROR_KINDS, 0)
+        self.latency = LatencySketch()
+        self.values = {}
+
+    def record(self, latency_s, error=None, **values):
+        """Ein Versuch, latency_s=None wenn der Sensor gar nicht gelesen wurde"""
+        self.attempts += 1
+        if latency_s is not None:
+            self.latency.add(latency_s * 1000)
+        if error:
+            self.errors[error] += 1
+            return
+        self.ok += 1
+        for key, value in values.items():
+            self.values.setdefault(key, ValueStats()).add(value)
+
+    def to_dict(self):
+        return {
+            'sensor_id': self.sensor_id,
+            'name': self.name,
+            'type': self.sensor_type,
+            'bus': self.bus,
+            'attempts': self.attempts,
+            'ok': self.ok,
+            'success_rate': round(self.ok / self.attempts, 4) if self.attempts else None,
+            'errors': dict(self.errors),
+            'latency_ms': {
+                key: round(value, 3) if value is not None else None
+                for key, value in (('min', self.latency.min),
+                                   ('p50', self.latency.percentile(50)),
+                                   ('p90', self.latency.percentile(90)),
+                                   ('p99', self.latency.percentile(99)),
+                                   ('max', self.latency.max))
+            },
+            'values': {key: stats.to_dict() for key, stats in self.values.items()},
+        }
+
+
+def classify_w1_error(error):
+    """W1ReadError in Fehlerklasse übersetzen"""
+    message = str(error)
+    if 'CRC' in message:
+        return 'crc'
+    if 'I/O' in message:
+        return 'io'
+    if 'Timeout' in message:
+        return 'timeout'
+    return 'invalid'
+
+
+def classify_dht22_error(error):
+    """DHT22 Exception in Fehlerklasse übersetzen"""
+    message = str(error)
+    if is_gpio_busy(error):
+        return 'gpio_busy'
+    if 'Checksum did not validate' in message:
+        return 'checksum'
+    if 'timed out' in message or 'Timed out' in message:
+        return 'timeout'
+    return 'other'
+
+
+# =============================================================================
+# SIMULATION (ohne Hardware)
+# =============================================================================
+
+class SimulatedW1Bus(W1Bus):
+    """1-Wire Bus mit simulierten DS18B20 (Latenz, CRC-Fehler, Rauschen)"""
+
+    def __init__(self, index, sensor_count, crc_rate):
+        super().__init__(f'/sim/w1_bus_master{index}')
+        self.supports_bulk = True
+        self.crc_rate = crc_rate
+        self.simulated = [f'28-sim{index:02d}{n:06x}' for n in range(sensor_count)]
+        self.base = {rom_id: random.uniform(20, 60) for rom_id in self.simulated}
+
+    def discover(self):
+        self.sensors = list(self.simulated)
+        return self.sensors
+
+    def trigger_bulk_conversion(self):
+        # 12 bit Konvertierung
+        time.sleep(random.gauss(0.75, 0.01))
+        return True
+
+    def read_sensor(self, rom_id):
+        # Scratchpad lesen, ohne Bulk-Read inklusive eigener Konvertierung
+        time.sleep(abs(random.gauss(0.015, 0.003)) + (0 if self.supports_bulk else 0.75))
+        if random.random() < self.crc_rate:
+            raise W1ReadError("CRC Fehler")
+        return round(self.base[rom_id] + random.gauss(0, 0.05), 3)
+
+
+class SimulatedDHT22Device:
+    """adafruit_dht.DHT22 Ersatz mit typischen Fehlerbildern"""
+
+    def __init__(self, error_rate):
+        self.error_rate = error_rate
+
+    @property
+    def temperature(self):
+        time.sleep(abs(random.gauss(0.25, 0.02)))
+        roll = random.random()
+        if roll < self.error_rate * 0.7:
+            raise RuntimeError("Checksum did not validate. Try again.")
+        if roll < self.error_rate:
+            raise RuntimeError("Timed out waiting for port.")
+        return round(random.gauss(18.0, 0.1), 1)
+
+    @property
+    def humidity(self):
+        return round(random.gauss(55.0, 0.5), 1)
+
+    def exit(self):
+        pass
+
+
+class SimulatedDHT22Sensor(DHT22Sensor):
+    def __init__(self, error_rate):
+        super().__init__()
+        self.error_rate = error_rate
+
+    def open(self):
+        self.device = SimulatedDHT22Device(self.error_rate)
+
+
+# =============================================================================
+# SOAK TEST
+# =============================================================================
+
+class SoakTest:
+    def __init__(self, buses, dht22, config, mode='bulk', parallel=True):
+        self.buses = buses
+        self.dht22 = dht22
+        self.config = config
+        self.mode = mode
+        self.parallel = parallel
+        self.cycles = 0
+        self.started = None
+        self.stats = {}
+
+        for bus in self.buses:
+            if mode == 'single':
+                bus.supports_bulk = False
+            self.stats[f'{bus.name}/bulk'] = SensorSoakStats(
+                f'{bus.name}/bulk', 'Bulk-Konvertierung', 'w1_bus', bus.name)
+            for rom_id in bus.sensors:
+                name = self.config.get('labels', rom_id, fallback=rom_id)
+                self.stats[rom_id] = SensorSoakStats(rom_id, name, 'ds18b20', bus.name)
+        if self.dht22:
+            name = self.config.get('labels', 'dht22', fallback='Raumklima')
+            self.stats['dht22'] = SensorSoakStats('dht22', name, 'dht22')
+
+    def sample_bus(self, bus):
+        """Ein Bus: Bulk-Konvertierung und jeden Sensor einzeln mit Latenz"""
+        if bus.supports_bulk:
+            start = time.monotonic()
+            try:
+                converted = bus.trigger_bulk_conversion()
+                self.stats[f'{bus.name}/bulk'].record(time.monotonic() - start,
+                                                      None if converted else 'timeout')
+            except OSError:
+                self.stats[f'{bus.name}/bulk'].record(time.monotonic() - start, 'io')
+                converted = True
+            if not converted:
+                # Wie im Dienst: Scratchpad enthält alte Werte, nicht lesen
+                for rom_id in bus.sensors:
+                    self.stats[rom_id].record(None, 'timeout')
+                return
+
+        for rom_id in bus.sensors:
+            start = time.monotonic()
+            try:
+                temp = bus.read_sensor(rom_id)
+                self.stats[rom_id].record(time.monotonic() - start, temperature=temp)
+            except W1ReadError as e:
+                self.stats[rom_id].record(time.monotonic() - start, classify_w1_error(e))
+
+    def sample_dht22(self):
+        """DHT22 einmal lesen, Fehler klassifizieren statt wiederholen"""
+        stats = self.stats['dht22']
+        start = time.monotonic()
+        try:
+            if self.dht22.device is None:
+                self.dht22.open()
+            temp = self.dht22.device.temperature
+            humidity = self.dht22.device.humidity
+            latency = time.monotonic() - start
+            if (temp is None or humidity is None or
+                    not (-40 <= temp <= 80 and 0 <= humidity <= 100)):
+                stats.record(latency, 'invalid')
+            else:
+                stats.record(latency, temperature=temp, humidity=humidity)
+        except Exception as e:
+            stats.record(time.monotonic() - start, classify_dht22_error(e))
+            if is_gpio_busy(e):
+                self.dht22.release()
+
+    def run(self, hours, interval, report_every, output):
+        """Messen bis die Zeit abgelaufen ist, dabei Zwischenberichte schreiben"""
+        self.started = datetime.now()
+        start = time.monotonic()
+        end = start + hours * 3600
+        next_report = start + report_every
+
+        print(f"🔄 Soak Test: {hours}h, alle {interval}s, Modus '{self.mode}', "
+              f"Busse {'parallel' if self.parallel else 'nacheinander'}")
+        # Wie der Dienst: ein Thread pro Bus (Statistiken sind pro Bus getrennt)
+        executor = ThreadPoolExecutor(max_workers=max(len(self.buses), 1),
+                                      thread_name_prefix='w1')
+        try:
+            while time.monotonic() < end:
+                cycle_start = time.monotonic()
+                if self.parallel:
+                    list(executor.map(self.sample_bus, self.buses))
+                else:
+                    for bus in self.buses:
+                        self.sample_bus(bus)
+                if self.dht22:
+                    self.sample_dht22()
+                self.cycles += 1
+
+                if self.cycles % 10 == 0:
+                    elapsed = (time.monotonic() - start) / 60
+                    print(f"   ⏳ {self.cycles} Zyklen, {elapsed:.0f} min")
+                if time.monotonic() >= next_report:
+                    self.write_report(output)
+                    next_report += report_every
+
+                time.sleep(max(0.0, interval - (time.monotonic() - cycle_start)))
+        except KeyboardInterrupt:
+            print("\n👋 Soak Test abgebrochen - schreibe Bericht")
+        finally:
+            executor.shutdown(wait=True)
+            if self.dht22:
+                self.dht22.release()
+
+        self.write_report(output)
+        self.print_summary()
+
+    def report(self):
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'cycles': self.cycles,
+            'mode': self.mode,
+            'parallel': self.parallel,
+            'sensors': [stats.to_dict() for stats in self.stats.values()],
+        }
+
+    def write_report(self, output):
+        """Bericht als <output>.json und <output>.csv schreiben"""
+        report = self.report()
+        with open(f'{output}.json', 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        columns = ['sensor_id', 'name', 'type', 'bus', 'attempts', 'ok', 'success_rate']
+        columns += [f'err_{kind}' for kind in SensorSoakStats.ERROR_KINDS]
+        columns += [f'latency_{key}_ms' for key in ('min', 'p50', 'p90', 'p99', 'max')]
+        columns += [f'{value}_{key}' for value in ('temperature', 'humidity')
+                    for key in ('mean', 'stddev', 'min', 'max', 'max_step')]
+        with open(f'{output}.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for sensor in report['sensors']:
+                row = {key: sensor[key] for key in columns[:7]}
+                row.update({f'err_{k}': v for k, v in sensor['errors'].items()})
+                row.update({f'latency_{k}_ms': v for k, v in sensor['latency_ms'].items()})
+                for value, stats in sensor['values'].items():
+                    row.update({f'{value}_{k}': stats[k]
+                                for k in ('mean', 'stddev', 'min', 'max', 'max_step')})
+                writer.writerow(row)
+
+    def print_summary(self):
+        print(f"\n📊 ERGEBNIS nach {self.cycles} Zyklen:")
+        for stats in self.stats.values():
+            data = stats.to_dict()
+            rate = (data['success_rate'] or 0) * 100
+            latency = data['latency_ms']
+            errors = ', '.join(f"{k}={v}" for k, v in data['errors'].items() if v)
+            line = (f"   {'✅' if rate >= 99 else '⚠️ ' if rate >= 90 else '❌'} "
+                    f"{stats.name} ({stats.sensor_id}): {rate:.1f}%")
+            if latency['p50'] is not None:
+                line += (f", p50 {latency['p50']:.0f} ms, p99 {latency['p99']:.0f} ms")
+            temperature = data['values'].get('temperature')
+            if temperature:
+                line += f", σ {temperature['stddev']:.2f}°C"
+            if errors:
+                line += f" [{errors}]"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak Test für DS18B20 und DHT22")
+    parser.add_argument('--hours', type=float, default=4.0, help="Dauer in Stunden")
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help="Sekunden zwischen zwei Messzyklen")
+    parser.add_argument('--mode', choices=('bulk', 'single'), default='bulk',
+                        help="DS18B20 per Bulk-Read oder einzeln messen")
+    parser.add_argument('--sequential', action='store_true',
+                        help="Busse nacheinander statt parallel (wie der Dienst) messen")
+    parser.add_argument('--output', default=f"soak_{datetime.now():%Y%m%d_%H%M}",
+                        help="Dateiname ohne Endung für JSON/CSV Bericht")
+    parser.add_argument('--report-every', type=float, default=10.0,
+                        help="Zwischenbericht alle n Minuten")
+    parser.add_argument('--no-dht22', action='store_true', help="DHT22 nicht testen")
+    parser.add_argument('--simulate', action='store_true',
+                        help="Simulierte Sensoren statt Hardware")
+    parser.add_argument('--sim-buses', type=int, default=2)
+    parser.add_argument('--sim-sensors', type=int, default=4, help="Sensoren pro Bus")
+    parser.add_argument('--sim-crc-rate', type=float, default=0.01)
+    parser.add_argument('--sim-dht22-error-rate', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print("🧪 PI5 SENSOR SOAK TEST")
+    print("=======================")
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini'))
+
+    if args.simulate:
+        buses = [SimulatedW1Bus(i, args.sim_sensors, args.sim_crc_rate)
+                 for i in range(1, args.sim_buses + 1)]
+        for bus in buses:
+            bus.discover()
+        dht22 = None if args.no_dht22 else SimulatedDHT22Sensor(args.sim_dht22_error_rate)
+    else:
+        buses = [bus for bus in discover_w1_buses() if bus.sensors]
+        dht22 = None if args.no_dht22 else DHT22Sensor()
+
+    sensor_count = sum(len(bus.sensors) for bus in buses)
+    print(f"🔌 {len(buses)} Bus(se), {sensor_count} DS18B20"
+          f"{', 1 DHT22' if dht22 else ''}{' (simuliert)' if args.simulate else ''}")
+    if not sensor_count and not dht22:
+        print("❌ Keine Sensoren gefunden")
+        sys.exit(1)
+
+    soak = SoakTest(buses, dht22, config, mode=args.mode, parallel=not args.sequential)
+    soak.run(args.hours, args.interval, args.report_every * 60, args.output)
+    print(f"\n💾 Bericht: {args.output}.json, {args.output}.csv")
+
+
+if __name__ == "__main__":
+    main()
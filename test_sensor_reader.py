@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests für sensor_reader.py (ohne Hardware)
+
+Aufruf:
+python3 -m pytest -q test_sensor_reader.py
+"""
+
+import logging
+import configparser
+from collections import deque
+
+import pytest
+
+import sensor_reader
+from sensor_reader import DedupFilter, HealthPolicy, Pi5SensorReader, SensorHealth, W1Bus
+
+
+def make_policy(**health):
+    config = configparser.ConfigParser()
+    config['health'] = {key: str(value) for key, value in health.items()}
+    return HealthPolicy(config)
+
+
+def run_dead_sensor(health, cycles):
+    """Sensor, der nie liefert - gibt die Zyklen zurück, in denen gelesen wurde"""
+    reads = []
+    for cycle in range(cycles):
+        if health.should_read(cycle):
+            health.record(cycle, False)
+            reads.append(cycle)
+    return reads
+
+
+def test_dead_sensor_backs_off_then_quarantines():
+    health = SensorHealth('28-dead', make_policy())
+    reads = run_dead_sensor(health, 200)
+
+    assert reads[:4] == [0, 1, 3, 7]
+    assert health.state == SensorHealth.QUARANTINE
+    # Quarantäne nach wenigen Lesungen statt nach window//2 echten Lesungen
+    assert len(reads) <= 8
+
+
+def test_quarantine_probes_less_often_than_backoff():
+    policy = make_policy()
+    assert policy.probe_interval > policy.backoff_max_cycles
+
+    health = SensorHealth('28-dead', policy)
+    reads = run_dead_sensor(health, 400)
+    gaps = [b - a for a, b in zip(reads, reads[1:])]
+    assert gaps[-1] == policy.probe_interval
+
+
+def test_single_failure_stays_ok_and_recovery_emits_event():
+    health = SensorHealth('28-flaky', make_policy())
+    assert health.record(0, False) is None
+    assert health.state == SensorHealth.OK
+    assert health.should_read(1)
+
+    event = health.record(1, False)
+    assert event['to'] == SensorHealth.BACKOFF
+    event = health.record(health.next_cycle, True)
+    assert (event['from'], event['to']) == (SensorHealth.BACKOFF, SensorHealth.OK)
+
+
+def test_recovery_from_quarantine_clears_history():
+    health = SensorHealth('28-dead', make_policy())
+    run_dead_sensor(health, 100)
+    assert health.state == SensorHealth.QUARANTINE
+
+    health.record(health.next_cycle, True)
+    assert health.state == SensorHealth.OK
+    assert health.failure_ratio == 0.0
+
+
+def make_record(message, key=None):
+    record = logging.LogRecord('pi5-sensors', logging.WARNING, __file__, 0,
+                               message, None, None)
+    if key:
+        record.key = key
+    return record
+
+
+def test_dedup_suppresses_repeats_within_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sensor_reader.time, 'monotonic', lambda: now[0])
+    dedup = DedupFilter(window=600)
+
+    assert dedup.filter(make_record("CRC Fehler", 'w1:28-aa'))
+    assert not dedup.filter(make_record("CRC Fehler", 'w1:28-aa'))
+    assert not dedup.filter(make_record("CRC Fehler", 'w1:28-aa'))
+    # Ohne Schlüssel wird nie unterdrückt
+    assert dedup.filter(make_record("Zusammenfassung"))
+
+    now[0] += 600
+    record = make_record("CRC Fehler", 'w1:28-aa')
+    assert dedup.filter(record)
+    assert "×3 in 10 min" in record.getMessage()
+
+
+def test_dedup_flush_reports_suppressed_count(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sensor_reader.time, 'monotonic', lambda: now[0])
+    dedup = DedupFilter(window=60)
+    messages = []
+    monkeypatch.setattr(sensor_reader.log, 'log',
+                        lambda level, message: messages.append(message))
+
+    dedup.filter(make_record("Timeout", 'dht22'))
+    dedup.filter(make_record("Timeout", 'dht22'))
+    dedup.flush()
+    assert messages == []
+
+    now[0] += 60
+    dedup.flush()
+    assert messages == ["Timeout (×1 weitere in 1 min)"]
+    assert dedup.seen == {}
+
+
+class ApiError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class FakeWriteApi:
+    """Lehnt Batches mit 'bad' ab (400) oder liefert immer denselben Status"""
+
+    def __init__(self, status=None):
+        self.status = status
+        self.written = []
+        self.calls = 0
+
+    def write(self, bucket, record):
+        self.calls += 1
+        if self.status:
+            raise ApiError(self.status)
+        if any('bad' in point for point in record):
+            raise ApiError(400)
+        self.written.extend(record)
+
+
+def make_reader(write_api, points):
+    reader = Pi5SensorReader.__new__(Pi5SensorReader)
+    reader.config = configparser.ConfigParser()
+    reader.client = object()
+    reader.write_api = write_api
+    reader.buffer = deque(points)
+    reader.next_health_check = 0.0
+    reader.health_backoff = sensor_reader.INFLUX_HEALTH_BACKOFF
+    reader.first_write = None
+    return reader
+
+
+def test_rejected_point_is_dropped_and_rest_written():
+    points = [f"t v={i}" for i in range(10)]
+    points[6] = "t v=bad"
+    write_api = FakeWriteApi()
+    reader = make_reader(write_api, points)
+
+    assert reader.write_to_influxdb() == 9
+    assert not reader.buffer
+    assert write_api.written == [p for p in points if 'bad' not in p]
+
+
+def test_write_error_keeps_client_and_backs_off():
+    write_api = FakeWriteApi(status=401)
+    reader = make_reader(write_api, ["t v=1"])
+    client = reader.client
+
+    assert reader.write_to_influxdb() == 0
+    assert reader.write_to_influxdb() == 0
+    assert write_api.calls == 1
+    assert reader.client is client and reader.write_api is write_api
+    assert reader.health_backoff > sensor_reader.INFLUX_HEALTH_BACKOFF
+    assert list(reader.buffer) == ["t v=1"]
+
+
+def test_bulk_timeout_reports_errors_instead_of_stale_values(tmp_path, monkeypatch):
+    for rom_id in ('28-aa', '28-bb'):
+        (tmp_path / rom_id).mkdir()
+        (tmp_path / rom_id / 'w1_slave').write_text("aa : crc=aa YES\naa t=21500\n")
+    (tmp_path / 'therm_bulk_read').write_text("0\n")
+    bus = W1Bus(str(tmp_path))
+    bus.sensors = ['28-aa', '28-bb']
+
+    values, errors = bus.read_all()
+    assert values == {'28-aa': 21.5, '28-bb': 21.5}
+
+    monkeypatch.setattr(bus, 'trigger_bulk_conversion', lambda: False)
+    values, errors = bus.read_all()
+    assert values == {}
+    assert errors == {'28-aa': "Bulk-Konvertierung Timeout",
+                      '28-bb': "Bulk-Konvertierung Timeout"}
+
+
+def write_config(tmp_path, text):
+    path = tmp_path / 'config.ini'
+    path.write_text(text)
+    return str(path)
+
+
+def test_load_config_allows_percent_in_label(tmp_path):
+    path = write_config(tmp_path, "[labels]\n28-aa = Feuchte 100%\n")
+    config, table, policy = sensor_reader.load_config(path)
+    assert table.ds18b20('28-aa', 'ds18b20_1', 1, 'w1_bus_master1').label == "Feuchte 100%"
+
+
+@pytest.mark.parametrize('text', [
+    "[ds18b20]\nresolution = 13\n",
+    "[ds18b20]\nmin = 50\nmax = 10\n",
+    "[28-aa]\ninterval = -1\n",
+    "[logging]\nsummary_every = 0\n",
+    "[logging]\nlevel = LAUT\n",
+    "[health]\nwindow = -5\n",
+    "[health]\nquarantine_ratio = 0\n",
+    "[health]\nbackoff_max_cycles = 16\nprobe_interval = 4\n",
+    "[labels\n",
+])
+def test_load_config_rejects_invalid_values(tmp_path, text):
+    with pytest.raises(sensor_reader.ConfigError):
+        sensor_reader.load_config(write_config(tmp_path, text))
+
+
+def test_recovery_after_backoff_keeps_single_failure_ok():
+    # Sensor mit langem Intervall: nicht gelesene Zyklen sind keine Fehler
+    health = SensorHealth('28-slow', make_policy())
+    health.record(0, False)
+    assert health.record(10, False)['to'] == SensorHealth.BACKOFF
+    assert health.record(20, True)['to'] == SensorHealth.OK
+
+    assert health.record(30, False) is None
+    assert health.state == SensorHealth.OK
+    assert health.failure_ratio == 0.75
+    assert health.next_cycle == 31
+
+
+class BusyDevice:
+    """adafruit_dht Ersatz: Leitung ist bei den ersten n Lesungen belegt"""
+
+    def __init__(self, state):
+        self.state = state
+
+    @property
+    def temperature(self):
+        if self.state['busy'] > 0:
+            self.state['busy'] -= 1
+            raise RuntimeError("GPIO busy")
+        return 21.0
+
+    @property
+    def humidity(self):
+        return 50.0
+
+    def exit(self):
+        pass
+
+
+def test_dht22_recovery_finishes_only_after_read_without_busy(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sensor_reader.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(sensor_reader, 'gpio_holders', lambda: [])
+    state = {'busy': 4}
+    dht22 = sensor_reader.DHT22Sensor()
+    monkeypatch.setattr(dht22, 'open', lambda: setattr(dht22, 'device', BusyDevice(state)))
+
+    backoffs = []
+    for _ in range(4):
+        assert dht22.read() is None
+        assert dht22.recovering and dht22.recoveries == 0
+        backoffs.append(dht22.backoff)
+        now[0] = dht22.next_attempt
+    assert backoffs == [1.0, 2.0, 4.0, 8.0]
+
+    assert dht22.read() == (21.0, 50.0)
+    assert not dht22.recovering
+    assert dht22.recoveries == 1
+    assert dht22.recovery_downtime == 15.0
+
+
+def test_load_config_rejects_missing_file(tmp_path):
+    with pytest.raises(sensor_reader.ConfigError):
+        sensor_reader.load_config(str(tmp_path / 'fehlt.ini'))
+
+
+def test_load_config_rejects_latin1_file(tmp_path):
+    path = tmp_path / 'config.ini'
+    path.write_bytes("[labels]\n28-aa = Rücklauf\n".encode('latin-1'))
+    with pytest.raises(sensor_reader.ConfigError, match="UTF-8"):
+        sensor_reader.load_config(str(path))
+
+
+def test_set_policy_resizes_history():
+    health = SensorHealth('28-aa', make_policy(window=20))
+    for cycle in range(10):
+        health.record(cycle, cycle % 2 == 0)
+
+    health.set_policy(make_policy(window=4))
+    assert health.history.maxlen == 4
+    assert list(health.history) == [True, False, True, False]
+    health.set_policy(make_policy(window=30))
+    assert health.history.maxlen == 30 and len(health.history) == 4
+
+
+class KeyRecorder(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.keys = []
+
+    def emit(self, record):
+        if hasattr(record, 'key'):
+            self.keys.append(record.key)
+
+
+def test_out_of_range_failures_share_one_dedup_key(tmp_path, monkeypatch):
+    (tmp_path / '28-aa').mkdir()
+    bus = W1Bus(str(tmp_path))
+    bus.sensors = ['28-aa']
+    bus.discover = lambda: bus.sensors
+    monkeypatch.setattr(sensor_reader, 'discover_w1_buses', lambda: [bus])
+
+    config = configparser.ConfigParser()
+    config.read_string("[28-aa]\nmax = 80\n")
+    reader = Pi5SensorReader.__new__(Pi5SensorReader)
+    reader.buses, reader.executor, reader.executor_workers = {}, None, 0
+    reader.table = sensor_reader.SensorTable(config)
+    reader.health_policy = HealthPolicy(config)
+    reader.health, reader.health_events, reader.last_read = {}, [], {}
+    reader.resolution = {'28-aa': 12}
+    reader.cycle = 0
+
+    recorder = KeyRecorder()
+    sensor_reader.log.addHandler(recorder)
+    try:
+        for cycle, value in enumerate(('85000', '85062')):
+            (tmp_path / '28-aa' / 'w1_slave').write_text(f"aa : crc=aa YES\naa t={value}\n")
+            reader.cycle = cycle
+            reader.last_read.clear()
+            assert reader.read_ds18b20_sensors() == []
+    finally:
+        sensor_reader.log.removeHandler(recorder)
+        reader.executor.shutdown()
+    assert recorder.keys == ['w1:28-aa:range', 'w1:28-aa:range']
+
+
+def test_update_logging_applies_ring_buffer_settings(tmp_path):
+    config = configparser.ConfigParser()
+    config['logging'] = {'ring_buffer': '5', 'ring_buffer_file': str(tmp_path / 'a.txt')}
+    handlers = list(sensor_reader.log.handlers)
+    dedup, ring = sensor_reader.setup_logging(config)
+    try:
+        for n in range(5):
+            sensor_reader.log.debug(f"Eintrag {n}")
+
+        config['logging'] = {'ring_buffer': '3', 'ring_buffer_file': str(tmp_path / 'b.txt')}
+        assert sensor_reader.update_logging(config, dedup, ring) is ring
+        assert [r.getMessage() for r in ring.records] == ["Eintrag 2", "Eintrag 3", "Eintrag 4"]
+        assert ring.path == str(tmp_path / 'b.txt')
+
+        config['logging'] = {'ring_buffer': '0'}
+        assert sensor_reader.update_logging(config, dedup, ring) is None
+        assert ring not in sensor_reader.log.handlers
+        assert sensor_reader.log.level == logging.INFO
+    finally:
+        sensor_reader.log.handlers[:] = handlers
+        sensor_reader.log.propagate = True
+        sensor_reader.log.setLevel(logging.NOTSET)
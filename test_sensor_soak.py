@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests für sensor_soak.py (ohne Hardware)
+
+Aufruf:
+python3 -m pytest -q test_sensor_soak.py
+"""
+
+import csv
+import json
+import random
+import statistics
+import configparser
+from datetime import datetime
+
+from sensor_soak import (LatencySketch, ValueStats, SensorSoakStats, SimulatedW1Bus,
+                         SoakTest)
+
+
+def test_latency_percentiles_within_sketch_accuracy():
+    random.seed(1)
+    values = [random.lognormvariate(3, 1) for _ in range(20000)]
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    values.sort()
+    for p in (50, 90, 99):
+        exact = values[int(p / 100 * len(values)) - 1]
+        assert abs(sketch.percentile(p) - exact) / exact < 0.05
+    assert sketch.min == values[0] and sketch.max == values[-1]
+    assert LatencySketch().percentile(50) is None
+
+
+def test_value_stats_match_statistics_module():
+    values = [20.0, 20.5, 19.75, 21.0, 20.25]
+    stats = ValueStats()
+    for value in values:
+        stats.add(value)
+
+    assert abs(stats.mean - statistics.mean(values)) < 1e-9
+    assert abs(stats.stddev - statistics.stdev(values)) < 1e-9
+    assert stats.max_step == 1.25
+
+
+def make_soak(sensor_count=2):
+    bus = SimulatedW1Bus(1, sensor_count, crc_rate=0.0)
+    bus.discover()
+    return SoakTest([bus], None, configparser.ConfigParser()), bus
+
+
+def test_bulk_timeout_records_sensors_as_timeout(monkeypatch):
+    soak, bus = make_soak()
+    monkeypatch.setattr(bus, 'trigger_bulk_conversion', lambda: False)
+    soak.sample_bus(bus)
+
+    for rom_id in bus.sensors:
+        data = soak.stats[rom_id].to_dict()
+        assert (data['attempts'], data['ok'], data['errors']['timeout']) == (1, 0, 1)
+        assert data['latency_ms']['p50'] is None
+        assert data['values'] == {}
+    assert soak.stats[f'{bus.name}/bulk'].errors['timeout'] == 1
+
+
+def test_report_json_and_csv_columns(tmp_path, monkeypatch):
+    soak, bus = make_soak()
+    monkeypatch.setattr(bus, 'trigger_bulk_conversion', lambda: True)
+    monkeypatch.setattr(bus, 'read_sensor', lambda rom_id: 21.5)
+    soak.started = datetime.now()
+    soak.sample_bus(bus)
+    soak.cycles = 1
+
+    output = str(tmp_path / 'soak')
+    soak.write_report(output)
+
+    with open(f'{output}.json') as f:
+        report = json.load(f)
+    assert report['cycles'] == 1 and report['parallel'] is True
+    assert report['started'] == soak.started.isoformat(timespec='seconds')
+
+    with open(f'{output}.csv', newline='') as f:
+        rows = list(csv.DictReader(f))
+    columns = set(rows[0])
+    assert {f'err_{kind}' for kind in SensorSoakStats.ERROR_KINDS} <= columns
+    assert {'latency_p50_ms', 'latency_p99_ms', 'temperature_mean',
+            'humidity_stddev'} <= columns
+    sensor = next(row for row in rows if row['sensor_id'] == bus.sensors[0])
+    assert (sensor['attempts'], sensor['ok'], sensor['temperature_mean']) == ('1', '1', '21.5')